@@ -217,13 +217,13 @@ def _install_ext(
         )
     shtub_path.chmod(0o775)
 
-    if dest_path.exists():
+    if dest_path.exists() or dest_path.is_symlink():
         _info.verbose(f'Removing existing shell script {dest_path}')
         dest_path.unlink()
 
     if is_dev:
         _info.verbose('Creating link to shell script.')
-        _run('ln', '-s', str(inx_path), str(dest_path))
+        dest_path.symlink_to(inx_path)
     else:
         _info.verbose(f'Copying shell script to {dest_path}')
         shutil.copyfile(inx_path, dest_path)
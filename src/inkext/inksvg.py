@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import functools
 import logging
 import re
 import typing
@@ -50,6 +51,27 @@ def utlco_ns(tag: str) -> str:
     return svg.add_ns(tag, UTLCO_NS, 'utlco')
 
 
+# Frequently used namespaced attribute names.
+_INKSCAPE_LABEL = inkscape_ns('label')
+_INKSCAPE_GROUPMODE = inkscape_ns('groupmode')
+_INKSCAPE_CURRENT_LAYER = inkscape_ns('current-layer')
+_INKSCAPE_DOCUMENT_UNITS = inkscape_ns('document-units')
+_SODIPODI_DOCNAME = sodipodi_ns('docname')
+_SODIPODI_INSENSITIVE = sodipodi_ns('insensitive')
+_SODIPODI_NAMEDVIEW = sodipodi_ns('namedview')
+_UTLCO_TAG = utlco_ns('tag')
+_SVG_G = svg.svg_ns('g')
+_SVG_USE_TAGS = frozenset((svg.svg_ns('use'), 'use'))
+_XLINK_HREF = svg.xlink_ns('href')
+
+
+@functools.lru_cache(maxsize=32)
+def _opacity_style(opacity: float) -> str:
+    """Inline layer style for the given opacity."""
+    opacity = min(max(opacity, 0.0), 1.0)
+    return f'opacity: {opacity:.2f};'
+
+
 class InkscapeSVGContext(svg.SVGContext):
     """SVG Context with Inkscape-specific methods."""
 
@@ -87,18 +109,21 @@ class InkscapeSVGContext(svg.SVGContext):
         basedoc = self.find('.//sodipodi:namedview')
         if basedoc is not None:
             self.ruler_units = basedoc.get(
-                inkscape_ns('document-units'),
+                _INKSCAPE_DOCUMENT_UNITS,
                 basedoc.get('units', self.doc_units),
             )
             # Current Inkscape layer
-            layer_id = basedoc.get(inkscape_ns('current-layer'))
+            layer_id = basedoc.get(_INKSCAPE_CURRENT_LAYER)
             if layer_id:
-                layer = self.get_node_by_id(layer_id)
+                # A single lookup isn't worth building the id index.
+                layer = svg.get_node_by_id(self.document, layer_id)
                 if layer is not None:
                     self.current_parent = layer
 
-        # Document clipping rectangle
-        self.cliprect = geom2d.Box((0, 0), self.get_document_size())
+    @functools.cached_property
+    def cliprect(self) -> geom2d.Box:
+        """Document clipping rectangle."""
+        return geom2d.Box((0, 0), self.get_document_size())
 
     def margin_cliprect(self, mtop: float, *args: float) -> geom2d.Box:
         """Create a clipping rectangle for document margins.
@@ -218,22 +243,24 @@ class InkscapeSVGContext(svg.SVGContext):
 
         if layer is None:
             layer_attrs = {
-                inkscape_ns('label'): layer_name,
-                inkscape_ns('groupmode'): 'layer',
+                _INKSCAPE_LABEL: layer_name,
+                _INKSCAPE_GROUPMODE: 'layer',
             }
             if tag is not None:
-                layer_attrs[utlco_ns('tag')] = tag
+                layer_attrs[_UTLCO_TAG] = tag
             if opacity is not None:
-                opacity = min(max(opacity, 0.0), 1.0)
-                layer_attrs['style'] = f'opacity: {opacity:.2f};'
+                layer_attrs['style'] = _opacity_style(opacity)
             if flipy:
                 transfrm = f'translate(0, {self.view_height:g}) scale(1, -1)'
                 layer_attrs['transform'] = transfrm
-            layer = etree.SubElement(parent, svg.svg_ns('g'), layer_attrs)
+            layer = etree.SubElement(parent, _SVG_G, layer_attrs)
             # layer = etree.SubElement(parent, 'g', layer_attrs)
         elif clear:
             # Remove subelements
+            for child in layer:
+                self._unindex_node(child)
             del layer[:]
+            self.invalidate_transform_cache()
 
         # if 'transform' in layer.attrib:
         #    del layer.attrib['transform']
@@ -241,11 +268,11 @@ class InkscapeSVGContext(svg.SVGContext):
 
     def set_layer_name(self, layer: TElement, name: str) -> None:
         """Rename an Inkscape layer."""
-        layer.set(inkscape_ns('label'), name)
+        layer.set(_INKSCAPE_LABEL, name)
 
     def get_layer_name(self, layer: TElement) -> str | None:
         """Return the name of the Inkscape layer."""
-        return typing.cast(str, layer.get(inkscape_ns('label')))
+        return typing.cast(str, layer.get(_INKSCAPE_LABEL))
 
     def get_parent_layer(self, node: TElement) -> TElement | None:
         """Get the layer that the node resides in.
@@ -273,7 +300,7 @@ class InkscapeSVGContext(svg.SVGContext):
 
     def layer_is_locked(self, layer: TElement) -> bool:
         """Check if the layer is locked."""
-        val = layer.get(sodipodi_ns('insensitive'))
+        val = layer.get(_SODIPODI_INSENSITIVE)
         return val is not None and val.lower() == 'true'
 
     def find(self, path: str) -> TElement | None:
@@ -362,6 +389,13 @@ class InkscapeSVGContext(svg.SVGContext):
         if elements is None:
             elements = self.docroot.iterchildren()
 
+        # Tag membership is tested for every node visited.
+        shapetags = frozenset(shapetags)
+
+        # Compile the layer name patterns once up front. They're kept
+        # separate since patterns with inline flags can't be combined.
+        skip_res = [re.compile(p) for p in skip_layers] if skip_layers else []
+
         shapes = []
         for node in elements:
             shapes.extend(
@@ -370,7 +404,7 @@ class InkscapeSVGContext(svg.SVGContext):
                     shapetags,
                     parent_transform,
                     True,
-                    skip_layers,
+                    skip_res,
                     accumulate_transform,
                 )
             )
@@ -379,10 +413,10 @@ class InkscapeSVGContext(svg.SVGContext):
     def _get_shape_nodes_recurs(  # noqa: PLR0912 too-many-branches
         self,
         node: TElement,
-        shapetags: Iterable[str],
+        shapetags: frozenset[str],
         parent_transform: tuple | None,
         check_parent: bool,
-        skip_layers: list[str] | None,
+        skip_res: list[re.Pattern],
         accumulate_transform: bool,
     ) -> list[tuple[TElement, geom2d.TMatrix | None]]:
         """Recursively get all shape elements in an element tree."""
@@ -403,14 +437,14 @@ class InkscapeSVGContext(svg.SVGContext):
 
         shapes = []
         if self.node_is_group(node):
-            if self.is_layer(node) and skip_layers:
+            if skip_res:
+                # The node is already known to be a group so it's
+                # a layer if it has a (non-empty) layer name.
                 layer_name = self.get_layer_name(node)
                 # logger.debug('layer: %s', layer_name)
-                if layer_name:
-                    for skip_layer in skip_layers:
-                        if re.match(skip_layer, layer_name):
-                            # logger.debug('skipping layer: %s', layer_name)
-                            return []
+                if layer_name and any(r.match(layer_name) for r in skip_res):
+                    # logger.debug('skipping layer: %s', layer_name)
+                    return []
             # Recursively traverse group children
             for child_node in node:
                 subnodes = self._get_shape_nodes_recurs(
@@ -418,14 +452,14 @@ class InkscapeSVGContext(svg.SVGContext):
                     shapetags,
                     node_transform,
                     False,
-                    skip_layers,
+                    skip_res,
                     accumulate_transform,
                 )
                 shapes.extend(subnodes)
-        elif node.tag == svg.svg_ns('use') or node.tag == 'use':
+        elif node.tag in _SVG_USE_TAGS:
             # A <use> element refers to another SVG element via an
             # xlink:href="#id" attribute.
-            refid = node.get(svg.xlink_ns('href'))
+            refid = node.get(_XLINK_HREF)
             if refid:
                 # [1:] to ignore leading '#' in reference
                 refnode = self.get_node_by_id(refid[1:])
@@ -447,7 +481,7 @@ class InkscapeSVGContext(svg.SVGContext):
                         shapetags,
                         node_transform,
                         False,
-                        skip_layers,
+                        skip_res,
                         accumulate_transform,
                     )
                     shapes.extend(subnodes)
@@ -494,15 +528,18 @@ def create_inkscape_document(
     docroot = document.getroot()
 
     # Add Inkscape-specific elements/attributes...
-    docroot.set(sodipodi_ns('docname'), doc_name or 'untitled')
-    namedview = etree.SubElement(docroot, sodipodi_ns('namedview'), id='base')
+    docroot.set(_SODIPODI_DOCNAME, doc_name or 'untitled')
+    namedview = etree.SubElement(docroot, _SODIPODI_NAMEDVIEW, id='base')
     namedview.set('units', doc_units)
-    namedview.set(inkscape_ns('document-units'), doc_units)
+    namedview.set(_INKSCAPE_DOCUMENT_UNITS, doc_units)
     if layer_name:
-        layer = etree.SubElement(docroot, svg.svg_ns('g'), id=layer_id)
+        layer_attrs = {
+            'id': layer_id,
+            _INKSCAPE_GROUPMODE: 'layer',
+            _INKSCAPE_LABEL: layer_name,
+        }
+        etree.SubElement(docroot, _SVG_G, layer_attrs)
         # layer = etree.SubElement(docroot, 'g', id=layer_id)
-        layer.set(inkscape_ns('groupmode'), 'layer')
-        layer.set(inkscape_ns('label'), layer_name)
-        namedview.set(inkscape_ns('current-layer'), layer_id)
+        namedview.set(_INKSCAPE_CURRENT_LAYER, layer_id)
 
     return document
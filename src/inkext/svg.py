@@ -2,23 +2,33 @@
 
 from __future__ import annotations
 
+import contextlib
+import functools
 import logging
 import math
 import random
 import re
 import string
 import sys
-from typing import TYPE_CHECKING, TextIO
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any, BinaryIO, ClassVar, TextIO
 
 # from xml.etree import ElementTree as etree
 import geom2d
 from geom2d import TPoint, arc, transform2d
+from geom2d.point import almost_equal
 from lxml import etree
 
 from . import css
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable, Iterator, Sequence
+    from collections.abc import (
+        Callable,
+        Generator,
+        Iterable,
+        Iterator,
+        Sequence,
+    )
 
     from geom2d.transform2d import TMatrix
     from typing_extensions import Self, TypeAlias
@@ -62,6 +72,15 @@ UNIT_CONV = {
     'yd': PPI * 36,
 }
 
+# Precomputed unit conversion scale factors by from-unit then to-unit.
+_UNIT_SCALE: dict[str, dict[str, float]] = {
+    from_unit: {
+        to_unit: from_scale / to_scale
+        for to_unit, to_scale in UNIT_CONV.items()
+    }
+    for from_unit, from_scale in UNIT_CONV.items()
+}
+
 TDocument: TypeAlias = (
     etree._ElementTree  # noqa: SLF001 pylint: disable=protected-access
 )
@@ -74,9 +93,10 @@ class SVGError(Exception):
     """SVG etree error."""
 
 
-_RE_CSS_UNIT = re.compile(f'({"|".join(UNIT_CONV.keys())})$')
+# Unit identifier lengths, longest first so 'rem' isn't taken as 'em'.
+_UNIT_LENGTHS = sorted({len(unit) for unit in UNIT_CONV}, reverse=True)
 _RE_FLOAT = re.compile(
-    r'(([-+]?[0-9]+(\.[0-9]*)?|[-+]?\.[0-9]+)([eE][-+]?[0-9]+)?)'
+    r'(?:[-+]?[0-9]+(?:\.[0-9]*)?|[-+]?\.[0-9]+)(?:[eE][-+]?[0-9]+)?'
 )
 
 
@@ -106,6 +126,114 @@ def strip_ns(tag: str) -> str:
     return tag.rpartition('}')[2]
 
 
+# Qualified tag names of elements this module creates or matches
+_SVG_CIRCLE = svg_ns('circle')
+_SVG_CLIPPATH = svg_ns('clipPath')
+_SVG_DEFS = svg_ns('defs')
+_SVG_ELLIPSE = svg_ns('ellipse')
+_SVG_G = svg_ns('g')
+_SVG_G_TAGS = frozenset((_SVG_G, 'g'))
+_SVG_MARKER = svg_ns('marker')
+_SVG_PATH = svg_ns('path')
+_SVG_RECT = svg_ns('rect')
+_SVG_TEXT = svg_ns('text')
+_SVG_TSPAN = svg_ns('tspan')
+_XML_SPACE = xml_ns('space')
+
+
+def _floatystr(value: float) -> str:
+    """Shortest round-trip string for a float without a trailing '.0'."""
+    return repr(float(value)).removesuffix('.0')
+
+
+def _transform_matrix(values: Sequence[float]) -> TMatrix:
+    return (
+        (values[0], values[2], values[4]),
+        (values[1], values[3], values[5]),
+    )
+
+
+def _transform_translate(values: Sequence[float]) -> TMatrix:
+    y = values[1] if len(values) > 1 else 0.0
+    return transform2d.matrix_translate(values[0], y)
+
+
+def _transform_scale(values: Sequence[float]) -> TMatrix:
+    x = values[0]
+    y = values[1] if len(values) > 1 else x
+    return transform2d.matrix_scale(x, y)
+
+
+def _transform_rotate(values: Sequence[float]) -> TMatrix:
+    num_values = len(values)
+    cx = values[1] if num_values > 1 else 0.0
+    cy = values[2] if num_values > 2 else 0.0
+    return transform2d.matrix_rotate(math.radians(values[0]), (cx, cy))
+
+
+def _transform_skew_x(values: Sequence[float]) -> TMatrix:
+    return transform2d.matrix_skew_x(math.radians(values[0]))
+
+
+def _transform_skew_y(values: Sequence[float]) -> TMatrix:
+    return transform2d.matrix_skew_y(math.radians(values[0]))
+
+
+@functools.lru_cache(maxsize=1024)
+def _style_visibility(style: str | None) -> tuple[str | None, str | None]:
+    """The `display` and `visibility` properties of an inline style."""
+    if not style:
+        return None, None
+    styles = css.inline_style_to_dict(style)
+    return styles.get('display'), styles.get('visibility')
+
+
+class _StyleTemplateMapping(Mapping[str, object]):
+    """Style template values with defaults and lazy unit conversion.
+
+    See :meth:`SVGContext.styles_from_templates`.
+    """
+
+    def __init__(
+        self,
+        svg: SVGContext,
+        default_map: dict,
+        template_map: dict | None,
+    ) -> None:
+        self._svg = svg
+        self._default_map = default_map
+        self._template_map = template_map if template_map is not None else {}
+        self._values: dict[str, object] = {}
+
+    def __getitem__(self, key: str) -> object:
+        value = self._values.get(key)
+        if value is not None:
+            return value
+        if key in self._default_map:
+            value = self._template_map.get(key)
+            if value is None:
+                value = self._default_map[key]
+        if value is None:
+            raise KeyError(key)
+        # If the value is a numeric type then it is assumed
+        # to already be in user units...
+        if key.endswith(('width', 'height', 'size')):
+            try:
+                value = float(value)
+            except ValueError:
+                value = self._svg.unit2uu(value)
+        self._values[key] = value
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        for key in self._default_map:
+            if key in self:
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
 class SVGContext:
     """SVG document context."""
 
@@ -119,6 +247,17 @@ class SVGContext:
         r'(matrix|translate|scale|rotate|skewX|skewY)\s*\(([^)]*)\)\s*,?',
         re.IGNORECASE,
     )
+    # Transform matrix builders by SVG transform function name.
+    _TRANSFORM_BUILDERS: ClassVar[
+        dict[str, Callable[[Sequence[float]], TMatrix]]
+    ] = {
+        'matrix': _transform_matrix,
+        'translate': _transform_translate,
+        'scale': _transform_scale,
+        'rotate': _transform_rotate,
+        'skewX': _transform_skew_x,
+        'skewY': _transform_skew_y,
+    }
 
     document: TDocument
     doc_units: str = 'px'
@@ -138,14 +277,9 @@ class SVGContext:
         Returns:
             An SVGContext
         """
-
-        def floatystr(value: float) -> str:
-            # Strip off trailing zeros from fixed point float string
-            return f'{value:f}'.rstrip('0').rstrip('.')
-
         docroot = etree.Element(svg_ns('svg'), nsmap=SVG_NS)
-        width_str = floatystr(width)
-        height_str = floatystr(height)
+        width_str = _floatystr(width)
+        height_str = _floatystr(height)
         docroot.set('width', f'{width_str}{doc_units}')
         docroot.set('height', f'{height_str}{doc_units}')
         docroot.set('viewBox', f'0 0 {width_str} {height_str}')
@@ -193,6 +327,14 @@ class SVGContext:
         #    self.docroot = document
         self.current_parent = self.docroot
         self.set_precision(self._DEFAULT_PRECISION)
+        # Composed parent transforms (relative to docroot) by element.
+        # lxml elements don't support weak references so this is
+        # a plain dict that must be invalidated after tree changes.
+        self._parent_transform_cache: dict[TElement, TMatrix | None] = {}
+        # Element id index, built lazily on first lookup.
+        self._id_index: dict[str, TElement] | None = None
+        # Ids handed out by generate_id() that may not be in the tree yet.
+        self._generated_ids: set[str] = set()
 
         # For some background on SVG coordinate systems
         # and how Inkscape deals with units:
@@ -203,14 +345,24 @@ class SVGContext:
         svg_width = self.docroot.get('width')
         svg_height = self.docroot.get('height')
         self.doc_units = scalar_unit(svg_width, default=scalar_unit(svg_height))
-        viewport_width = self.unit_convert(svg_width, to_unit=self.doc_units)
-        viewport_height = self.unit_convert(svg_height, to_unit=self.doc_units)
+        # The viewBox and derived view quantities are computed lazily.
+
+    @functools.cached_property
+    def _view_geometry(self) -> tuple[list[float], float, float, float]:
+        """The viewBox, view width, view height, and view scale."""
+        viewport_width = self.unit_convert(
+            self.docroot.get('width'), to_unit=self.doc_units
+        )
+        viewport_height = self.unit_convert(
+            self.docroot.get('height'), to_unit=self.doc_units
+        )
 
         # Get the viewBox to determine user units and root scale factor
         viewboxattr = self.docroot.get('viewBox')
         if viewboxattr is not None:
-            p = re.compile(r'[,\s\t]+')
-            viewbox = [float(value) for value in p.split(viewboxattr)]
+            viewbox = [
+                float(value) for value in viewboxattr.replace(',', ' ').split()
+            ]
         else:
             viewbox = [0, 0, viewport_width, viewport_height]
         viewbox_width = viewbox[2] - viewbox[0]
@@ -228,10 +380,27 @@ class SVGContext:
         if not geom2d.float_eq(scale_width, scale_height):
             raise ValueError('viewBox aspect ratio does not match viewport.')
 
-        self.view_width = viewbox_width
-        self.view_height = viewbox_height
-        self.view_scale = scale_width
-        self.viewbox = viewbox
+        return viewbox, viewbox_width, viewbox_height, scale_width
+
+    @functools.cached_property
+    def viewbox(self) -> list[float]:
+        """The document viewBox."""
+        return self._view_geometry[0]
+
+    @functools.cached_property
+    def view_width(self) -> float:
+        """The viewBox width in user units."""
+        return self._view_geometry[1]
+
+    @functools.cached_property
+    def view_height(self) -> float:
+        """The viewBox height in user units."""
+        return self._view_geometry[2]
+
+    @functools.cached_property
+    def view_scale(self) -> float:
+        """The viewBox to viewport scale factor."""
+        return self._view_geometry[3]
 
     def get_document_size(self) -> tuple[float, float]:
         """Return width and height of document in user units as a tuple (W, H)."""
@@ -311,12 +480,44 @@ class SVGContext:
         """Write the SVG document to a stream output."""
         # Pretty print if in debug mode
         stream.write('<?xml version="1.0" encoding="UTF-8" standalone="no"?>\n')
-        data = etree.tostring(
-            self.document.getroot(),
-            encoding='unicode',
-            pretty_print=pretty_print,
-        )
-        stream.write(data)
+        buffer = getattr(stream, 'buffer', None)
+        if buffer is None:
+            # Not a file so just write the whole string.
+            data = etree.tostring(
+                self.document.getroot(),
+                encoding='unicode',
+                pretty_print=pretty_print,
+            )
+            stream.write(data)
+            return
+        # Stream the serialized document directly to the underlying
+        # binary file to avoid building the whole thing as a string.
+        stream.flush()
+        with etree.xmlfile(buffer, encoding='utf-8') as xf:
+            xf.write(self.document.getroot(), pretty_print=pretty_print)
+        buffer.flush()
+
+    @contextlib.contextmanager
+    def create_path_batch(
+        self, stream: BinaryIO, style: str | None = None
+    ) -> Generator[SVGPathWriter, None, None]:
+        """Write path elements directly to an output stream.
+
+        For bulk output of simple paths this avoids building
+        the elements in the document tree.
+        The paths are written as children of a new SVG group element.
+
+        Args:
+            stream: A binary output stream.
+            style: Optional CSS style of the enclosing group.
+
+        Yields:
+            A path writer.
+        """
+        attrs = {'style': style} if style else {}
+        with etree.xmlfile(stream, encoding='utf-8') as xf:  # noqa: SIM117
+            with xf.element(_SVG_G, attrs, nsmap={None: SVG_NS['svg']}):
+                yield SVGPathWriter(self, xf)
 
     def set_precision(self, precision: int | None = None) -> None:
         """Set the output precision.
@@ -324,13 +525,14 @@ class SVGContext:
         Args:
             precision: The number of digits after the decimal point.
         """
-        self._fmt_float = '{}' if precision is None else f'{{:.{precision}f}}'
+        # These are printf-style templates since '%' formatting is
+        # measurably faster than str.format() for short float fields.
+        self._fmt_float = '%s' if precision is None else f'%.{precision}f'
         self._fmt_point = f'{self._fmt_float},{self._fmt_float}'
         self._fmt_move = f'M {self._fmt_point}'
         self._fmt_line = f'M {self._fmt_point} L {self._fmt_point}'
         self._fmt_arc = (
-            f'A {self._fmt_point} {self._fmt_float}'
-            f' {{:d}} {{:d}} {self._fmt_point}'
+            f'A {self._fmt_point} {self._fmt_float} %d %d {self._fmt_point}'
         )
         self._fmt_curve = (
             f'C {self._fmt_point} {self._fmt_point} {self._fmt_point}'
@@ -349,7 +551,62 @@ class SVGContext:
         Returns:
             A node if found otherwise None.
         """
-        return get_node_by_id(self.document, node_id)
+        id_index = self._id_index
+        if id_index is None:
+            id_index = self._build_id_index()
+        node = id_index.get(node_id)
+        if node is not None and (
+            node.get('id') != node_id or not self._is_attached(node)
+        ):
+            # Changed or removed behind the index's back.
+            del id_index[node_id]
+            return None
+        return node
+
+    def _is_attached(self, node: TElement) -> bool:
+        """Return True if the node is a descendant of the document root."""
+        # Detached lxml elements still belong to the same document
+        # so getroottree() can't be used to tell.
+        docroot = self.docroot
+        return any(parent is docroot for parent in node.iterancestors())
+
+    def invalidate_id_index(self) -> None:
+        """Discard the element id index.
+
+        Elements created or removed by methods of this class
+        are kept in the index but this should be called after
+        element ids are set or elements are added directly.
+        """
+        self._id_index = None
+
+    def _index_node(self, node: TElement) -> None:
+        """Add the ids of an attached element and its descendants."""
+        id_index = self._id_index
+        if id_index is not None:
+            for child in node.iter():
+                child_id = child.get('id')
+                if child_id:
+                    id_index.setdefault(child_id, child)
+
+    def _unindex_node(self, node: TElement) -> None:
+        """Remove the ids of a detached element and its descendants."""
+        id_index = self._id_index
+        if id_index:
+            for child in node.iter():
+                child_id = child.get('id')
+                if child_id and id_index.get(child_id) is child:
+                    del id_index[child_id]
+
+    def _build_id_index(self) -> dict[str, TElement]:
+        """Index all the document elements by id in one pass."""
+        id_index: dict[str, TElement] = {}
+        for node in self.docroot.iterdescendants():
+            node_id = node.get('id')
+            # Keep the first one in document order like find() does.
+            if node_id and node_id not in id_index:
+                id_index[node_id] = node
+        self._id_index = id_index
+        return id_index
 
     def get_element_transform(
         self, node: TElement, root: TElement | None = None
@@ -390,7 +647,48 @@ class SVGContext:
         """
         if root is None:
             root = self.docroot
-        # matrix = ((1.0, 0.0, 0.0), (0.0, 1.0, 0.0))
+        if root is not self.docroot:
+            return self._compose_parent_transform(node, root)
+
+        # Walk up to the nearest ancestor with a known parent transform
+        # then compose and cache the transforms back down to the node.
+        cache = self._parent_transform_cache
+        uncached = []
+        matrix: TMatrix | None = None
+        while node not in cache:
+            parent = node.getparent()
+            if parent is None or parent is root:
+                cache[node] = None
+                break
+            uncached.append((node, parent))
+            node = parent
+        else:
+            matrix = cache[node]
+        for child, parent in reversed(uncached):
+            parent_matrix = self.parse_transform_attr(parent.get('transform'))
+            if parent_matrix:
+                if matrix:
+                    matrix = transform2d.compose_transform(
+                        matrix, parent_matrix
+                    )
+                else:
+                    matrix = parent_matrix
+            cache[child] = matrix
+        return matrix
+
+    def invalidate_transform_cache(self) -> None:
+        """Discard cached parent transforms.
+
+        This should be called after any element transforms are
+        modified or elements are moved to a different parent
+        other than by methods of this class.
+        """
+        self._parent_transform_cache.clear()
+
+    def _compose_parent_transform(
+        self, node: TElement, root: TElement
+    ) -> TMatrix | None:
+        """Compose parent transforms up to (but not including) `root`."""
         matrix: TMatrix | None = None
         parent = node.getparent()
         while parent is not None and parent is not root:
@@ -428,29 +726,21 @@ class SVGContext:
         if node is None:
             return _recurs
 
-        visibility: str | None = None
-        style = node.get('style')
-        if style:
-            styles = css.inline_style_to_dict(style)
-            if styles.get('display') == 'none':
+        # Walk up the ancestors until visibility is determined.
+        # Parents are always checked if the node visibility is `inherit`.
+        element: TElement | None = node
+        while element is not None:
+            display, visibility = _style_visibility(element.get('style'))
+            if display == 'none':
                 return False
-            visibility = styles.get('visibility')
-        if visibility is None:
-            visibility = node.get('visibility')
-
-        if visibility is not None:
-            if visibility == 'inherit' and not check_parent:
-                # Recursively determine parent visibility
-                parent = node.getparent()
-                if parent:
-                    return self.node_is_visible(parent, _recurs=True)
+            if visibility is None:
+                visibility = element.get('visibility')
             if visibility in {'hidden', 'collapse'}:
                 return False
-
-        if check_parent:
-            parent = node.getparent()
-            if parent is not None:
-                return self.node_is_visible(parent, _recurs=True)
+            if not check_parent and visibility != 'inherit':
+                return True
+            check_parent = True
+            element = element.getparent()
 
         return True
 
@@ -465,40 +755,24 @@ class SVGContext:
         """
         if not stransform:
             return None
-        if stransform:
-            stransform = stransform.strip()
-        transforms = self._TRANSFORM_RE.findall(stransform)
+        return self._parse_transform_str(stransform)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def _parse_transform_str(stransform: str) -> TMatrix | None:
+        """Parse a non-empty SVG transform list.
+
+        Documents tend to repeat identical transform strings
+        so the result is cached by string value.
+        Matrices are tuples so they can be safely shared.
+        """
+        builders = SVGContext._TRANSFORM_BUILDERS
         matrices = []
-        for transform, args in transforms:
-            matrix = None
-            values = [float(n) for n in args.replace(',', ' ').split()]
-            num_values = len(values)
-            if transform == 'translate':
-                x = values[0]
-                y = values[1] if num_values > 1 else 0.0
-                matrix = transform2d.matrix_translate(x, y)
-            if transform == 'scale':
-                x = values[0]
-                y = values[1] if num_values > 1 else x
-                matrix = transform2d.matrix_scale(x, y)
-            if transform == 'rotate':
-                a = math.radians(values[0])
-                cx = values[1] if num_values > 1 else 0.0
-                cy = values[2] if num_values > 2 else 0.0
-                matrix = transform2d.matrix_rotate(a, (cx, cy))
-            if transform == 'skewX':
-                a = math.radians(values[0])
-                matrix = transform2d.matrix_skew_x(a)
-            if transform == 'skewY':
-                a = math.radians(values[0])
-                matrix = transform2d.matrix_skew_y(a)
-            if transform == 'matrix':
-                matrix = (
-                    (values[0], values[2], values[4]),
-                    (values[1], values[3], values[5]),
-                )
-            if matrix is not None:
-                matrices.append(matrix)
+        for transform, args in SVGContext._TRANSFORM_RE.findall(stransform):
+            builder = builders.get(transform)
+            if builder is not None:
+                values = [float(n) for n in args.replace(',', ' ').split()]
+                matrices.append(builder(values))
 
         if matrices:
             # Compose all the transforms into one matrix
@@ -553,25 +827,8 @@ class SVGContext:
         Returns:
             A dictionary of inline styles.
         """
-        # Create a template mapping that fills in missing values
-        # from the default map.
-        mapping = {}
-        for key in default_map:
-            value = None
-            if template_map is not None:
-                value = template_map.get(key)
-            if value is None:
-                value = default_map[key]
-            if value is not None:
-                # If the value is a numeric type then it is assumed
-                # to already be in user units...
-                if key.endswith(('width', 'height', 'size')):
-                    try:
-                        value = float(value)
-                    except ValueError:
-                        value = self.unit2uu(value)
-                mapping[key] = value
-
+        # Template values are looked up and converted on demand.
+        mapping = _StyleTemplateMapping(self, default_map, template_map)
         styles = {}
         for name, template_str in style_templates.items():
             template = string.Template(template_str)
@@ -580,35 +837,54 @@ class SVGContext:
 
     def node_is_group(self, node: TElement) -> bool:
         """Return True if the node is an SVG group."""
-        return bool(node.tag == svg_ns('g') or node.tag == 'g')
+        return node.tag in _SVG_G_TAGS
 
     def remove_node(self, node: TElement) -> None:
         """Remove node from parent."""
         parent = node.getparent()
         if parent is not None:
             parent.remove(node)
+            self.invalidate_transform_cache()
+            self._unindex_node(node)
+
+    def find_defs(self) -> TElement | None:
+        """Find the document <defs> element.
+
+        Returns:
+            The first <defs> element or None if there isn't one.
+        """
+        # Looking at just the root's children first is much cheaper
+        # than a full document search and that's almost always
+        # where <defs> lives.
+        defs = self.docroot.find(_SVG_DEFS)
+        if defs is None:
+            defs = self.docroot.find(f'.//{_SVG_DEFS}')
+        return defs
 
     def create_clip_path(self, path: TElement) -> TElement | None:
         """Create an SVG clipPath."""
-        defs = self.docroot.find(f'.//{svg_ns("defs")}')
-        if defs:
+        defs = self.find_defs()
+        if defs is not None:
             node_id = self.generate_id('clipPath')
             attrs = {'id': node_id, 'clipPathUnits': 'userSpaceOnUse'}
-            clip = etree.SubElement(defs, svg_ns('clipPath'), attrs)
+            clip = etree.SubElement(defs, _SVG_CLIPPATH, attrs)
             # path.getparent().remove(path)
             clip.append(path)
+            self.invalidate_transform_cache()
+            self._index_node(clip)
             return clip
         return None
 
     def set_clip_path(self, node: TElement, clip_path: TElement) -> None:
         """Set the clipping path to the specified node."""
-        if clip_path.tag != svg_ns('clipPath'):
+        if clip_path.tag != _SVG_CLIPPATH:
             path = self.create_clip_path(clip_path)
             if path is None:
                 raise SVGError('Unable to create clip path.')
             clip_path = path
         elif clip_path.get('id') is None:
             clip_path.set('id', self.generate_id('clipPath'))
+            self._index_node(clip_path)
         node.set('clip-path', f'url(#{clip_path.get("id")})')
 
     def create_group(
@@ -623,9 +899,11 @@ class SVGContext:
         attrs = {}
         if style:
             attrs['style'] = style
-        group = etree.SubElement(parent, svg_ns('g'), attrs)
+        group = etree.SubElement(parent, _SVG_G, attrs)
         if children is not None:
             group.extend(children)
+            self.invalidate_transform_cache()
+            self._index_node(group)
         return group
 
     def create_rect(
@@ -639,15 +917,16 @@ class SVGContext:
         """Create an SVG rect element."""
         if parent is None:
             parent = self.current_parent
+        scale = self.view_scale
         attrs = {
-            'x': str(self._scale(position[0])),
-            'y': str(self._scale(position[1])),
-            'width': str(self._scale(width)),
-            'height': str(self._scale(height)),
+            'x': str(position[0] * scale),
+            'y': str(position[1] * scale),
+            'width': str(width * scale),
+            'height': str(height * scale),
         }
         if style is not None and style:
             attrs['style'] = style
-        return etree.SubElement(parent, svg_ns('rect'), attrs)
+        return etree.SubElement(parent, _SVG_RECT, attrs)
 
     def create_circle(
         self,
@@ -659,14 +938,15 @@ class SVGContext:
         """Create an SVG circle element."""
         if parent is None:
             parent = self.current_parent
+        scale = self.view_scale
         attrs = {
-            'r': str(self._scale(radius)),
-            'cx': str(self._scale(center[0])),
-            'cy': str(self._scale(center[1])),
+            'r': str(radius * scale),
+            'cx': str(center[0] * scale),
+            'cy': str(center[1] * scale),
         }
         if style is not None and style:
             attrs['style'] = style
-        return etree.SubElement(parent, svg_ns('circle'), attrs)
+        return etree.SubElement(parent, _SVG_CIRCLE, attrs)
 
     def create_ellipse(
         self,
@@ -685,17 +965,18 @@ class SVGContext:
         is_ellipse = geom2d.is_zero(start_angle) and geom2d.is_zero(sweep_angle)
         # if geom2d.is_zero(phi) and not is_arc:
         if is_ellipse:
+            scale = self.view_scale
             attrs = {
-                'rx': self._fmt_float.format(self._scale(rx)),
-                'ry': self._fmt_float.format(self._scale(ry)),
-                'cx': self._fmt_float.format(center[0]),
-                'cy': self._fmt_float.format(center[1]),
+                'rx': self._fmt_float % (rx * scale),
+                'ry': self._fmt_float % (ry * scale),
+                'cx': self._fmt_float % center[0],
+                'cy': self._fmt_float % center[1],
             }
             if not geom2d.is_zero(phi):
                 m = transform2d.matrix_rotate(phi, origin=center)
                 attrs['transform'] = transform_attr(m)
             return self._create_svgelem(
-                'ellipse', attrs, style=style, parent=parent
+                _SVG_ELLIPSE, attrs, style=style, parent=parent
             )
 
         # Otherwise it's an elliptical arc and rendered as a path
@@ -703,7 +984,9 @@ class SVGContext:
             center, rx, ry, phi, start_angle, sweep_angle
         )
         attrs = {'d': arc.to_svg_path(scale=self.view_scale, add_move=True)}
-        return self._create_svgelem('path', attrs, style=style, parent=parent)
+        return self._create_svgelem(
+            _SVG_PATH, attrs, style=style, parent=parent
+        )
 
     def create_line(
         self,
@@ -714,16 +997,20 @@ class SVGContext:
         attrs: dict[str, str] | None = None,
     ) -> TElement:
         """Create an SVG path consisting of one line segment."""
-        line_path = self._fmt_line.format(
-            self._scale(p1[0]),
-            self._scale(p1[1]),
-            self._scale(p2[0]),
-            self._scale(p2[1]),
-        )
         if attrs is None:
             attrs = {}
-        attrs['d'] = line_path
-        return self._create_svgelem('path', attrs, style, parent)
+        attrs['d'] = self.line_to_svgpath(p1, p2)
+        return self._create_svgelem(_SVG_PATH, attrs, style, parent)
+
+    def line_to_svgpath(self, p1: TPoint, p2: TPoint) -> str:
+        """SVG path data for a line segment."""
+        scale = self.view_scale
+        return self._fmt_line % (
+            p1[0] * scale,
+            p1[1] * scale,
+            p2[0] * scale,
+            p2[1] * scale,
+        )
 
     def create_arc(
         self,
@@ -736,7 +1023,7 @@ class SVGContext:
         if attrs is None:
             attrs = {}
         attrs['d'] = arc.to_svg_path(self.view_scale, add_move=True)
-        return self._create_svgelem('path', attrs, style, parent)
+        return self._create_svgelem(_SVG_PATH, attrs, style, parent)
 
     def create_circular_arc(
         self,
@@ -749,22 +1036,22 @@ class SVGContext:
         attrs: dict[str, str] | None = None,
     ) -> TElement:
         """Create an SVG circular arc."""
-        m = self._fmt_move.format(
-            self._scale(startp[0]), self._scale(startp[1])
-        )
-        a = self._fmt_arc.format(
-            self._scale(radius),
-            self._scale(radius),
+        scale = self.view_scale
+        r = radius * scale
+        m = self._fmt_move % (startp[0] * scale, startp[1] * scale)
+        a = self._fmt_arc % (
+            r,
+            r,
             0,
             0,
             sweep_flag,
-            self._scale(endp[0]),
-            self._scale(endp[1]),
+            endp[0] * scale,
+            endp[1] * scale,
         )
         if attrs is None:
             attrs = {}
         attrs['d'] = m + ' ' + a
-        return self._create_svgelem('path', attrs, style, parent)
+        return self._create_svgelem(_SVG_PATH, attrs, style, parent)
 
     def create_curve(
         self,
@@ -785,13 +1072,18 @@ class SVGContext:
         Returns:
             An SVG path Element node.
         """
-        p1, cp1, cp2, p2 = control_points
         if attrs is None:
             attrs = {}
-        mpart = self._fmt_move.format(self._scale(p1[0]), self._scale(p1[1]))
+        attrs['d'] = self.curve_to_svgpath(control_points)
+        return self._create_svgelem(_SVG_PATH, attrs, style, parent)
+
+    def curve_to_svgpath(self, control_points: Sequence[TPoint]) -> str:
+        """SVG path data for a cubic bezier curve."""
+        p1, cp1, cp2, p2 = control_points
+        scale = self.view_scale
+        mpart = self._fmt_move % (p1[0] * scale, p1[1] * scale)
         cpart = self._format_curve(cp1, cp2, p2)
-        attrs['d'] = f'{mpart} {cpart}'
-        return self._create_svgelem('path', attrs, style, parent)
+        return f'{mpart} {cpart}'
 
     def _format_curve(
         self,
@@ -799,13 +1091,14 @@ class SVGContext:
         cp2: TPoint,
         p2: TPoint,
     ) -> str:
-        return self._fmt_curve.format(
-            self._scale(cp1[0]),
-            self._scale(cp1[1]),
-            self._scale(cp2[0]),
-            self._scale(cp2[1]),
-            self._scale(p2[0]),
-            self._scale(p2[1]),
+        scale = self.view_scale
+        return self._fmt_curve % (
+            cp1[0] * scale,
+            cp1[1] * scale,
+            cp2[0] * scale,
+            cp2[1] * scale,
+            p2[0] * scale,
+            p2[1] * scale,
         )
 
     def create_polygon(
@@ -836,35 +1129,65 @@ class SVGContext:
         """
         if not vertices:
             return None
-        d = [
-            'M',
-            self._fmt_point.format(
-                self._scale(vertices[0][0]), self._scale(vertices[0][1])
-            ),
-            'L',
-        ]
-        d.extend(
-            [
-                self._fmt_point.format(self._scale(p[0]), self._scale(p[1]))
-                for p in vertices[1:]
-            ]
-        )
-        # for p in vertices[1:]:
-        #    d.append(
-        #        self._fmt_point.format(self._scale(p[0]), self._scale(p[1]))
-        #    )
-        if close_polygon and vertices[0] != vertices[-1]:
-            d.append(
-                self._fmt_point.format(
-                    self._scale(vertices[0][0]), self._scale(vertices[0][1])
-                )
-            )
-        if close_path:
-            d.append('Z')
         if attrs is None:
             attrs = {}
-        attrs['d'] = ' '.join(d)
-        return self._create_svgelem('path', attrs, style, parent)
+        attrs['d'] = self.polygon_to_svgpath(
+            vertices, close_polygon, close_path
+        )
+        return self._create_svgelem(_SVG_PATH, attrs, style, parent)
+
+    def polygon_to_svgpath(
+        self,
+        vertices: Sequence[TPoint],
+        close_polygon: bool = True,
+        close_path: bool = False,
+    ) -> str:
+        """SVG path data for a non-empty polygon.
+
+        See :meth:`create_polygon`.
+        """
+        is_closed = almost_equal(vertices[0], vertices[-1])
+        return self._format_polygon(
+            vertices,
+            repeat_first=close_polygon and not is_closed,
+            drop_last=False,
+            close_path=close_path,
+        )
+
+    def _format_polygon(
+        self,
+        vertices: Sequence[TPoint],
+        repeat_first: bool,
+        drop_last: bool,
+        close_path: bool,
+    ) -> str:
+        """Format polygon path data with a single template.
+
+        Args:
+            vertices: A non-empty sequence of 2D polygon vertices.
+            repeat_first: Append the first vertex to close the polygon.
+            drop_last: Leave out the last (closing) vertex.
+            close_path: Append 'Z' to close the path.
+        """
+        # Scale all the coordinates up front then format the
+        # whole path with a single template instead of per point.
+        scale = self.view_scale
+        nverts = len(vertices)
+        npoints = nverts + repeat_first
+        # Preallocated and filled by slice to avoid list regrowth.
+        coords = [0.0] * (npoints * 2)
+        coords[0 : nverts * 2 : 2] = [p[0] * scale for p in vertices]
+        coords[1 : nverts * 2 : 2] = [p[1] * scale for p in vertices]
+        if repeat_first:
+            coords[-2:] = coords[:2]
+        elif drop_last:
+            npoints -= 1
+            del coords[-2:]
+        fmt_point = self._fmt_point
+        fmt = f'M {fmt_point} L' + f' {fmt_point}' * (npoints - 1)
+        if close_path:
+            fmt += ' Z'
+        return fmt % tuple(coords)
 
     def create_polygons(
         self,
@@ -895,40 +1218,40 @@ class SVGContext:
         """
         if not polygons:
             return None
-        d = []
+        fmt_point = self._fmt_point
+        scale = self.view_scale
+        d: list[str] = []
         for vertices in polygons:
-            d += [
-                'M',
-                self._fmt_point.format(
-                    self._scale(vertices[0][0]), self._scale(vertices[0][1])
-                ),
-                'L',
+            if len(vertices) > 32:
+                # One template is faster than formatting each point
+                # once polygons have more than a few dozen vertices.
+                is_closed = almost_equal(vertices[0], vertices[-1])
+                d.append(
+                    self._format_polygon(
+                        vertices,
+                        repeat_first=(
+                            close_polygon and not is_closed and not close_path
+                        ),
+                        drop_last=is_closed and close_path,
+                        close_path=close_path and (is_closed or close_polygon),
+                    )
+                )
+                continue
+            points = [
+                fmt_point % (p[0] * scale, p[1] * scale) for p in vertices
             ]
-            d.extend(
-                [
-                    self._fmt_point.format(self._scale(p[0]), self._scale(p[1]))
-                    for p in vertices[1:]
-                ]
-            )
-            if geom2d.P(vertices[0]) != vertices[-1]:
+            d += ('M', points[0], 'L')
+            d += points[1:]
+            if not almost_equal(vertices[0], vertices[-1]):
                 if close_polygon:
-                    if close_path:
-                        d.append('Z')
-                    else:
-                        d.append(
-                            self._fmt_point.format(
-                                self._scale(vertices[0][0]),
-                                self._scale(vertices[0][1]),
-                            )
-                        )
+                    d.append('Z' if close_path else points[0])
             elif close_path:
-                del d[-1]
-                d.append('Z')
+                d[-1] = 'Z'
 
         if attrs is None:
             attrs = {}
         attrs['d'] = ' '.join(d)
-        return self._create_svgelem('path', attrs, style, parent)
+        return self._create_svgelem(_SVG_PATH, attrs, style, parent)
 
     def create_polypath(
         self,
@@ -964,33 +1287,40 @@ class SVGContext:
         """
         if not path:
             return None
+        fmt_point = self._fmt_point
+        fmt_curve = self._fmt_curve
+        fmt_arc = self._fmt_arc
+        scale = self.view_scale
         p1 = path[0][0]
-        d = [
-            'M',
-            self._fmt_point.format(self._scale(p1[0]), self._scale(p1[1])),
-        ]
-        for segment in path:
-            if isinstance(segment, geom2d.Line) or len(segment) == 2:
+        d = ['M', fmt_point % (p1[0] * scale, p1[1] * scale)]
+        segments: Sequence[Sequence[Any]] = path
+        for segment in segments:
+            # Line, CubicBezier, and Arc are fixed size tuples
+            # so the length alone identifies the segment type.
+            size = len(segment)
+            if size == 2:
                 # Assume this is a line segment with two endpoints:
                 # ((x1, y1), (x2, y2))
                 p2 = segment[1]
-                d.extend(
-                    (
-                        'L',
-                        self._fmt_point.format(
-                            self._scale(p2[0]), self._scale(p2[1])
-                        ),
-                    )
-                )
-            elif isinstance(segment, geom2d.CubicBezier) or len(segment) == 4:
+                d += ('L', fmt_point % (p2[0] * scale, p2[1] * scale))
+            elif size == 4:
                 # Assume this is a cubic Bezier:
                 # ((x1, y1), (cx1, cx1), (cx2, cx2), (x2, y2))
                 cp1 = segment[1]
                 cp2 = segment[2]
                 p2 = segment[3]
-                d.append(self._format_curve(cp1, cp2, p2))
-            # elif isinstance(segment, geom2d.Line) or len(segment) == 5:
-            elif isinstance(segment, geom2d.Arc) or len(segment) == 5:
+                d.append(
+                    fmt_curve
+                    % (
+                        cp1[0] * scale,
+                        cp1[1] * scale,
+                        cp2[0] * scale,
+                        cp2[1] * scale,
+                        p2[0] * scale,
+                        p2[1] * scale,
+                    )
+                )
+            elif size == 5:
                 # Assume this is an arc segment:
                 # ((x1, y1), (x2, y2), radius, angle, center)
                 p2 = segment[1]
@@ -998,25 +1328,26 @@ class SVGContext:
                     segment[3], float
                 ):
                     raise TypeError('Invalid arc segment.')
-                radius = segment[2]
-                angle = segment[3]
-                sweep_flag = 0 if angle < 0 else 1
-                arc = self._fmt_arc.format(
-                    self._scale(radius),
-                    self._scale(radius),
-                    0,
-                    0,
-                    sweep_flag,
-                    self._scale(p2[0]),
-                    self._scale(p2[1]),
+                radius = segment[2] * scale
+                sweep_flag = 0 if segment[3] < 0 else 1
+                d.append(
+                    fmt_arc
+                    % (
+                        radius,
+                        radius,
+                        0,
+                        0,
+                        sweep_flag,
+                        p2[0] * scale,
+                        p2[1] * scale,
+                    )
                 )
-                d.append(arc)
         if close_path:
             d.append('Z')
         if attrs is None:
             attrs = {}
         attrs['d'] = ' '.join(d)
-        return self._create_svgelem('path', attrs, style, parent)
+        return self._create_svgelem(_SVG_PATH, attrs, style, parent)
 
     def create_simple_marker(
         self,
@@ -1030,20 +1361,18 @@ class SVGContext:
 
         The glyph Element is placed under the document root.
         """
-        defs = self.docroot.find(f'.//{svg_ns("defs")}')
+        defs = self.find_defs()
         if defs is None:
-            defs = etree.SubElement(self.docroot, svg_ns('defs'))
+            defs = etree.SubElement(self.docroot, _SVG_DEFS)
         elif replace:
             # If a marker with the same id already exists
             # then remove it first.
             node = defs.find(f'.//*[@id="{marker_id}"]')
             if node is not None:
-                parent = node.getparent()
-                if parent is not None:
-                    parent.remove(node)
+                self.remove_node(node)
         marker = etree.SubElement(
             defs,
-            svg_ns('marker'),
+            _SVG_MARKER,
             {
                 'id': marker_id,
                 'orient': 'auto',
@@ -1054,13 +1383,14 @@ class SVGContext:
         )
         etree.SubElement(
             marker,
-            svg_ns('path'),
+            _SVG_PATH,
             {
                 'd': d,
                 'style': style,
                 'transform': transform,
             },
         )
+        self._index_node(marker)
         return marker
 
     def _create_svgelem(
@@ -1070,12 +1400,22 @@ class SVGContext:
         style: str | None = None,
         parent: TElement | None = None,
     ) -> TElement:
-        """Create an SVG element."""
+        """Create an SVG element.
+
+        Args:
+            tag: Namespace qualified tag name (ie `_SVG_PATH`).
+            attrs: Element attributes. Updated with the style if any.
+            style: A CSS style string.
+            parent: The parent element. Default is the current parent.
+        """
         if parent is None:
             parent = self.current_parent
         if style:
             attrs['style'] = style
-        return etree.SubElement(parent, svg_ns(tag), attrs)
+        node = etree.SubElement(parent, tag, attrs)
+        if 'id' in attrs and self._id_index is not None:
+            self._id_index.setdefault(attrs['id'], node)
+        return node
 
     def create_text(
         self,
@@ -1090,16 +1430,17 @@ class SVGContext:
         """Create a text block."""
         if parent is None:
             parent = self.current_parent
+        scale = self.view_scale
         attrs: dict[str, str] = {
-            'x': str(self._scale(x)),
-            'y': str(self._scale(y)),
-            xml_ns('space'): 'preserve',
+            'x': str(x * scale),
+            'y': str(y * scale),
+            _XML_SPACE: 'preserve',
         }
         if style:
             attrs['style'] = style
         if text_anchor is not None:
             attrs['text-anchor'] = text_anchor
-        text_elem = etree.SubElement(parent, svg_ns('text'), attrs)
+        text_elem = etree.SubElement(parent, _SVG_TEXT, attrs)
         # if isinstance(text, basestring):
         if isinstance(text, str):
             self._create_text_line(text, x, y, text_elem)
@@ -1117,7 +1458,11 @@ class SVGContext:
         if parent is None:
             parent = self.current_parent
         if parent is not None:
+            if node in self._parent_transform_cache:
+                # Moved from another parent
+                self.invalidate_transform_cache()
             parent.append(node)
+            self._index_node(node)
 
     def generate_id(self, prefix: str = '_id') -> str:
         """Create a unique XML id attribute value.
@@ -1127,29 +1472,80 @@ class SVGContext:
                 Default prefix is '_id'.
 
         Returns:
-            A random id string that has a fairly low chance of collision
-            with previously generated ids.
+            A random id string that does not collide with
+            indexed document ids (see :meth:`get_node_by_id`)
+            or previously generated ids.
+            Call :meth:`invalidate_id_index` first if element ids
+            have been set directly.
         """
-        return random_id(prefix=prefix, rootnode=self.docroot)
+        id_index = self._id_index
+        if id_index is None:
+            id_index = self._build_id_index()
+        generated_ids = self._generated_ids
+        id_attr = random_id(prefix=prefix)
+        while id_attr in id_index or id_attr in generated_ids:
+            id_attr = random_id(prefix=prefix)
+        generated_ids.add(id_attr)
+        return id_attr
 
     def _create_text_line(
         self, text: str, x: float, y: float, parent: TElement
     ) -> TElement:
-        attrs = {
-            'x': str(self._scale(x)),
-            'y': str(self._scale(y)),
-        }
-        tspan_elem = etree.SubElement(parent, svg_ns('tspan'), attrs)
+        scale = self.view_scale
+        attrs = {'x': str(x * scale), 'y': str(y * scale)}
+        tspan_elem = etree.SubElement(parent, _SVG_TSPAN, attrs)
         tspan_elem.text = text
         return tspan_elem
 
-    def _scale(self, n: float) -> float:
-        """Scale the scalar value to viewbox."""
-        return n * self.view_scale
 
-    def _scalep(self, p: TPoint) -> TPoint:
-        """Scale the point value to viewbox."""
-        return (p[0] * self.view_scale, p[1] * self.view_scale)
+class SVGPathWriter:
+    """Incremental SVG path element writer.
+
+    See :meth:`SVGContext.create_path_batch`.
+    """
+
+    def __init__(self, svg: SVGContext, xf: etree.xmlfile) -> None:
+        """New path writer.
+
+        Args:
+            svg: The SVG context used for scaling and formatting.
+            xf: An lxml incremental XML writer.
+        """
+        self._svg = svg
+        self._xf = xf
+
+    def line(self, p1: TPoint, p2: TPoint, style: str | None = None) -> None:
+        """Write an SVG path consisting of one line segment."""
+        self._write_path(self._svg.line_to_svgpath(p1, p2), style)
+
+    def curve(
+        self, control_points: Sequence[TPoint], style: str | None = None
+    ) -> None:
+        """Write an SVG cubic bezier curve path."""
+        self._write_path(self._svg.curve_to_svgpath(control_points), style)
+
+    def polygon(
+        self,
+        vertices: Sequence[TPoint],
+        close_polygon: bool = True,
+        close_path: bool = False,
+        style: str | None = None,
+    ) -> None:
+        """Write an SVG path describing a polygon.
+
+        Nothing is written if the list of vertices is empty.
+        See :meth:`SVGContext.create_polygon`.
+        """
+        if vertices:
+            d = self._svg.polygon_to_svgpath(
+                vertices, close_polygon, close_path
+            )
+            self._write_path(d, style)
+
+    def _write_path(self, d: str, style: str | None) -> None:
+        attrs = {'d': d, 'style': style} if style else {'d': d}
+        with self._xf.element(_SVG_PATH, attrs):
+            pass
 
 
 def geompath_to_svgpath(
@@ -1177,22 +1573,29 @@ def geompath_to_svgpath(
     it = iter(path)
     try:
         first_segment = next(it)
-        first_point = first_segment.p1
-        last_point = first_segment.p2
     except StopIteration:
         pass
     else:
-        dparts = [f'M {first_point.to_svg(scale=scale)}']
-        prev_type: type = geom2d.Line
-        for segment in path:
-            add_prefix = bool(prev_type != type(segment))
+        first_point = first_segment.p1
+        # A command prefix is only needed when the segment type changes
+        # (the initial M implies L for subsequent coordinates).
+        prev_type: type = type(first_segment)
+        dparts = [
+            f'M {first_point.to_svg(scale=scale)}',
+            first_segment.to_svg_path(scale, prev_type is not geom2d.Line),
+        ]
+        last_segment = first_segment
+        # Continue with the same iterator so that a one-shot iterable
+        # doesn't lose its first segment.
+        for segment in it:
+            segment_type = type(segment)
             dparts.append(
-                segment.to_svg_path(scale=scale, add_prefix=add_prefix)
+                segment.to_svg_path(scale, segment_type is not prev_type)
             )
-            prev_type = type(segment)
-            last_point = segment.p2
+            prev_type = segment_type
+            last_segment = segment
 
-        if close_path and first_point != last_point:
+        if close_path and first_point != last_segment.p2:
             dparts.append('Z')
 
         return ' '.join(dparts)
@@ -1230,17 +1633,27 @@ def path_tokenizer(path_data: str) -> Iterator[tuple[str, bool]]:
     # See:
     #     https://codereview.stackexchange.com/questions/28502/svg-path-parsing
     #     https://www.w3.org/TR/SVG/paths.html#PathDataBNF
+    #
+    # A character state machine is used rather than a regex scanner
+    # since most path tokens are only a few characters long and the
+    # per-match overhead of a regex dominates for short tokens.
     # --------------------------------------------------------------------------
+    # Local lookups are cheaper than globals in the per-character loop
+    digit_exp = DIGIT_EXP
+    comma_wsp = COMMA_WSP
+    drawto_command = DRAWTO_COMMAND
+    sign = SIGN
+    exponent = EXPONENT
     in_float = False
     entity = ''
     for char in path_data:
-        if char in DIGIT_EXP:
+        if char in digit_exp:
             entity += char
-        elif char in COMMA_WSP and entity:
+        elif char in comma_wsp and entity:
             yield (entity, False)  # Number parameter
             in_float = False
             entity = ''
-        elif char in DRAWTO_COMMAND:
+        elif char in drawto_command:
             if entity:
                 yield (entity, False)  # Number parameter
                 in_float = False
@@ -1253,8 +1666,8 @@ def path_tokenizer(path_data: str) -> Iterator[tuple[str, bool]]:
             else:
                 entity += '.'
                 in_float = True
-        elif char in SIGN:
-            if entity and entity[-1] not in EXPONENT:
+        elif char in sign:
+            if entity and entity[-1] not in exponent:
                 yield (entity, False)  # Number parameter
                 in_float = False
                 entity = char
@@ -1276,32 +1689,44 @@ def _radians(a: str) -> float:
 # output-command, # Canonical command
 # num-params, # Expected number of parameters
 # [casts, ...], # float, int
-# [coord-axis, ...] # 0 == x, 1 == y, -1 == not a coordinate param
+# [coord-axis, ...], # 0 == x, 1 == y, -1 == not a coordinate param
+# flags, # Command specific post-processing, see below
 # ]}
 # fmt: off
-PathdefType = dict[str, tuple[str, int, tuple, tuple]]
+PathdefType = dict[str, tuple[str, int, tuple, tuple, int]]
+_MOVETO = 1
+_CLOSEPATH = 2
+_HLINETO = 4
+_VLINETO = 8
+_SMOOTH = 16
+_CONTROL = 32
 _PATHDEFS: PathdefType = {
-    'M': ('M', 2, (float, float), (0, 1)),
-    'L': ('L', 2, (float, float), (0, 1)),
-    'H': ('L', 1, (float,), (0,)),
-    'V': ('L', 1, (float,), (1,)),
+    'M': ('M', 2, (float, float), (0, 1), _MOVETO),
+    'L': ('L', 2, (float, float), (0, 1), 0),
+    'H': ('L', 1, (float,), (0,), _HLINETO),
+    'V': ('L', 1, (float,), (1,), _VLINETO),
     'C': ('C', 6, (float, float, float, float, float, float),
-             (0, 1, 0, 1, 0, 1)),
-    'S': ('C', 4, (float, float, float, float), (0, 1, 0, 1)),
-    'Q': ('Q', 4, (float, float, float, float), (0, 1, 0, 1)),
-    'T': ('Q', 2, (float, float), (0, 1)),
+             (0, 1, 0, 1, 0, 1), _CONTROL),
+    'S': ('C', 4, (float, float, float, float), (0, 1, 0, 1), _SMOOTH),
+    'Q': ('Q', 4, (float, float, float, float), (0, 1, 0, 1), _CONTROL),
+    'T': ('Q', 2, (float, float), (0, 1), _SMOOTH),
     'A': (
         'A', 7,
         (float, float, _radians, int, int, float, float),
-        (-1, -1, -1, -1, -1, 0, 1)
+        (-1, -1, -1, -1, -1, 0, 1),
+        0,
     ),
-    'Z': ('L', 0, (), ()),
+    'Z': ('L', 0, (), (), _CLOSEPATH),
 }
 # fmt: on
 
 
-# pylint: disable=too-many-statements
-def parse_path(path_data: str) -> Iterator[tuple]:  # noqa: PLR0912 PLR0915
+# Set to False to disable memoization of parsed path data, for example
+# when parsing many very long unique paths where memory use matters.
+PARSE_PATH_CACHE = True
+
+
+def parse_path(path_data: str) -> Iterator[tuple[str, tuple]]:
     """Parse an SVG path definition string.
 
     Converts relative values to absolute and
@@ -1312,116 +1737,126 @@ def parse_path(path_data: str) -> Iterator[tuple]:  # noqa: PLR0912 PLR0915
     No exceptions are raised. This is by design so that parsing
     is relatively forgiving of input.
 
-    Implemented as a generator so that memory usage can be minimized
-    for very long paths.
+    Parsed results are memoized by path data string
+    unless `PARSE_PATH_CACHE` is False, in which case
+    path components are generated incrementally.
 
     Args:
         path_data: The 'd' attribute value of a SVG path element.
 
     Yields:
-        A path component 2-tuple of the form (cmd, params).
+        A path component 2-tuple of the form (cmd, params),
+        where params is a tuple of parameter values.
     """
-    # Current command context
-    current_cmd = None
-    # Current path command definition
-    pathdef = _PATHDEFS['M']
+    if PARSE_PATH_CACHE:
+        yield from _parse_path_cached(path_data)
+    else:
+        yield from _parse_path(path_data)
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_path_cached(path_data: str) -> tuple[tuple[str, tuple], ...]:
+    return tuple(_parse_path(path_data))
+
+
+# pylint: disable=too-many-statements
+def _parse_path(  # noqa: PLR0912 PLR0915
+    path_data: str,
+) -> Iterator[tuple[str, tuple]]:
+    tokenizer = path_tokenizer(path_data)
+    try:
+        token, is_command = next(tokenizer)
+    except StopIteration:
+        return
+    # Path data must begin with a moveto
+    if token.upper() != 'M':
+        return
     # Start of sub-path
     moveto = (0.0, 0.0)
     # Current drawing position
     pen = (0.0, 0.0)
     # Last control point for curves
     last_control = pen
-    # True if the command is relative
-    cmd_is_relative = False
-    # True if the parser expects a command
-    expecting_command = True
-    # Current accumulated parameters
+    # Parameter scratch list, reused since results are yielded as tuples
     params: list = []
-
-    tokenizer = path_tokenizer(path_data)
-    pushed_token = None
+    # Unconsumed part of a token that began with an arc flag
+    remainder = ''
 
     while True:
-        if pushed_token:
-            (  # pylint: disable=unpacking-non-sequence
-                token,
-                is_command,
-            ) = pushed_token
-            pushed_token = None
-        else:
-            try:
-                token, is_command = next(tokenizer)
-            except StopIteration:
-                break
-        if expecting_command:
-            if current_cmd is None and token.upper() != 'M':
-                break
-            if is_command:
-                cmd_is_relative = token.islower()
-                cmd = token.upper()
-                pathdef = _PATHDEFS[cmd]
-                current_cmd = cmd
-                if current_cmd == 'Z':
-                    # Push back an empty token since this has no parameters
-                    pushed_token = ('', False)
-            else:
-                # In implicit command
-                if current_cmd == 'M':
-                    # Any subsequent parameters are for an implicit LineTo
-                    current_cmd = 'L'
-                    pathdef = _PATHDEFS[current_cmd]
-                # Push back token for parameter accumulation on next pass
-                pushed_token = (token, is_command)
-            expecting_command = False
-        else:
-            if is_command:
-                # Bail if number of parameters doesn't match command
-                break
-
-            # Accumulate parameters for the current command
-            param_index = len(params)
-            if param_index < pathdef[1]:
-                cast = pathdef[2][param_index]
-                value = cast(token)
-                if cmd_is_relative:
-                    # Get the axis this shorthand is referring to
-                    # 0 = X, 1 = Y, -1 = none
-                    axis = pathdef[3][param_index]
-                    if axis >= 0:
-                        # Make relative value absolute
-                        value += pen[axis]
-                params.append(value)
-                param_index += 1
-
-            if param_index == pathdef[1]:
-                # All parameters have been accumulated now process command
-                if current_cmd == 'M':
-                    moveto = (params[0], params[1])
-                elif current_cmd == 'Z':
-                    params.extend(moveto)
-                    pushed_token = None
-                elif current_cmd == 'H':
-                    params.append(pen[1])
-                elif current_cmd == 'V':
-                    params.insert(0, pen[0])
-                elif current_cmd in {'S', 'T'}:
-                    params.insert(0, pen[1] + (pen[1] - last_control[1]))
-                    params.insert(0, pen[0] + (pen[0] - last_control[0]))
-                if current_cmd in {'C', 'Q'}:
-                    last_control = (params[-4], params[-3])
-                else:
-                    last_control = pen
-                output_cmd = pathdef[0]
-                yield (output_cmd, params)
-                # Update the drawing position to the last end point.
-                pen = (params[-2], params[-1])
-                params = []
-                expecting_command = True
+        # The current token is either a command or, for an implicit
+        # command, the first parameter of a repeated command.
+        if is_command:
+            cmd = token.upper()
+            cmd_is_relative = token.islower()
+            pathdef = _PATHDEFS[cmd]
+        elif cmd == 'M':
+            # Any subsequent parameters are for an implicit LineTo
+            cmd = 'L'
+            pathdef = _PATHDEFS[cmd]
+        output_cmd, num_params, casts, axes, flags = pathdef
+
+        # Accumulate parameters for the current command
+        params.clear()
+        for param_index in range(num_params):
+            if remainder:
+                token = remainder
+                remainder = ''
+            elif param_index or is_command:
+                try:
+                    token, is_command = next(tokenizer)
+                except StopIteration:
+                    return
+                if is_command:
+                    # Bail if number of parameters doesn't match command
+                    return
+            cast = casts[param_index]
+            if cast is int and len(token) > 1 and token[0] in '01':
+                # Arc flags are a single digit and need not be separated
+                # from the following parameter (ie 'A 1 1 0 01 5 5').
+                remainder = token[1:]
+                token = token[0]
+            value = cast(token)
+            if cmd_is_relative:
+                # Get the axis this shorthand is referring to
+                # 0 = X, 1 = Y, -1 = none
+                axis = axes[param_index]
+                if axis >= 0:
+                    # Make relative value absolute
+                    value += pen[axis]
+            params.append(value)
+
+        # All parameters have been accumulated now process command
+        if flags:
+            if flags == _MOVETO:
+                moveto = (params[0], params[1])
+            elif flags == _CLOSEPATH:
+                params.extend(moveto)
+            elif flags == _HLINETO:
+                params.append(pen[1])
+            elif flags == _VLINETO:
+                params.insert(0, pen[0])
+            elif flags == _SMOOTH:
+                params.insert(0, pen[1] + (pen[1] - last_control[1]))
+                params.insert(0, pen[0] + (pen[0] - last_control[0]))
+        last_control = (params[-4], params[-3]) if flags == _CONTROL else pen
+        yield (output_cmd, tuple(params))
+        # Update the drawing position to the last end point.
+        pen = (params[-2], params[-1])
+
+        try:
+            token, is_command = next(tokenizer)
+        except StopIteration:
+            return
 
 
 # pylint: enable=too-many-statements
 
 
+# explode_path segment templates keyed by number of command parameters.
+# Parameters use %s to match str() formatting.
+_EXPLODE_FMTS = {n: 'M %f %f %s' + ' %s' * n for n in range(1, 8)}
+
+
 def explode_path(path_data: str) -> list:
     """Break the path at node points into component segments.
 
@@ -1439,9 +1874,8 @@ def explode_path(path_data: str) -> list:
             continue
         p2 = (params[-2], params[-1])
         if p1 is not None:
-            paramstr = ' '.join([str(param) for param in params])
-            d = f'M {p1[0]:f} {p1[1]:f} {cmd} {paramstr}'
-            dlist.append(d)
+            fmt = _EXPLODE_FMTS[len(params)]
+            dlist.append(fmt % (p1[0], p1[1], cmd, *params))
         p1 = p2
     return dlist
 
@@ -1473,22 +1907,16 @@ def create_svg_document(
     if nsmap is None:
         nsmap = SVG_NS
 
-    def floatystr(value: str | float) -> str:
-        # Strip off trailing zeros from fixed point float string
-        # This is similar to the 'g' format but wont display scientific
-        # notation for big numbers.
-        return f'{float(value):f}'.rstrip('0').rstrip('.')
-
     if isinstance(width, str):
         doc_units = scalar_unit(width, default=doc_units)
-        width_str = floatystr(scalar_value(width))
+        width_str = _floatystr(scalar_value(width))
     else:
-        width_str = floatystr(width)
+        width_str = _floatystr(width)
     if isinstance(height, str):
         doc_units = scalar_unit(height, default=doc_units)
-        height_str = floatystr(scalar_value(height))
+        height_str = _floatystr(scalar_value(height))
     else:
-        height_str = floatystr(height)
+        height_str = _floatystr(height)
 
     docroot = etree.Element(svg_ns('svg'), nsmap=nsmap)
     docroot.set('width', f'{width_str}{doc_units}')
@@ -1513,10 +1941,10 @@ def random_id(prefix: str = '_svg', rootnode: TElement | None = None) -> str:
         A random id string that has a fairly low chance of collision
         with previously generated ids.
     """
-    id_attr = f'{prefix}{random.randint(1, 2 ** 31):d}'
+    id_attr = f'{prefix}{random.getrandbits(31):d}'
     if rootnode is not None:
         while get_node_by_id(rootnode, id_attr) is not None:
-            id_attr = f'{prefix}{random.randint(1, 2 ** 31):d}'
+            id_attr = f'{prefix}{random.getrandbits(31):d}'
     return id_attr
 
 
@@ -1552,10 +1980,11 @@ def scalar_unit(scalar: str | None, default: str = 'px') -> str:
 
     For example: 'in' from '15.3in', or 'px' from '101px'.
     """
-    if scalar:
-        m = _RE_CSS_UNIT.search(scalar)
-        if m:
-            return m.string[m.start() : m.end()]
+    if scalar and scalar[-1].isalpha():
+        for n in _UNIT_LENGTHS:
+            unit = scalar[-n:]
+            if unit in UNIT_CONV:
+                return unit
     return default
 
 
@@ -1567,7 +1996,7 @@ def scalar_value(scalar: str | None) -> float:
     if scalar:
         m = _RE_FLOAT.match(scalar)
         if m:
-            return float(m.string[m.start() : m.end()])
+            return float(m.group())
     return 0.0
 
 
@@ -1598,4 +2027,10 @@ def unit_convert(
         from_unit = scalar_unit(value, default=from_unit)
         value = scalar_value(value)
 
-    return value * (UNIT_CONV.get(from_unit, 1) / UNIT_CONV.get(to_unit, 1))
+    if from_unit == to_unit:
+        return float(value)
+    try:
+        return value * _UNIT_SCALE[from_unit][to_unit]
+    except KeyError:
+        # Unknown units are treated as px
+        return value * (UNIT_CONV.get(from_unit, 1) / UNIT_CONV.get(to_unit, 1))
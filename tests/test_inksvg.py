@@ -0,0 +1,159 @@
+"""Test Inkscape SVG context methods."""
+
+from __future__ import annotations
+
+import io
+import pathlib
+from typing import TYPE_CHECKING
+
+from lxml import etree
+
+from inkext import inksvg, svg
+
+if TYPE_CHECKING:
+    import pytest
+
+TESTDIR = pathlib.Path(__file__).parent
+TEST1_FILE = TESTDIR / 'files/test1.svg'
+
+
+def _parse_test1() -> inksvg.InkscapeSVGContext:
+    with TEST1_FILE.open() as f:
+        return inksvg.InkscapeSVGContext.parse(f)
+
+
+def test_skip_layers() -> None:
+    """Test filtering shape elements by layer name patterns."""
+    svg = _parse_test1()
+
+    ids = [node.get('id') for node, _ in svg.get_shape_elements()]
+    assert ids == ['path1', 'path2', 'rect1', 'path3']
+
+    shapes = svg.get_shape_elements(skip_layers=['Layer 2'])
+    ids = [node.get('id') for node, _ in shapes]
+    assert ids == ['path1', 'path2', 'path3']
+
+    shapes = svg.get_shape_elements(skip_layers=['.* 1$', 'Layer 3'])
+    ids = [node.get('id') for node, _ in shapes]
+    assert ids == ['rect1']
+
+    # Patterns with inline flags
+    shapes = svg.get_shape_elements(skip_layers=['(?i)layer 2', 'Layer 3'])
+    ids = [node.get('id') for node, _ in shapes]
+    assert ids == ['path1', 'path2']
+
+
+def test_parent_transform_cache() -> None:
+    """Test cached parent transforms and invalidation."""
+    svg = _parse_test1()
+    layer1 = svg.get_node_by_id('layer1')
+    path1 = svg.get_node_by_id('path1')
+    assert layer1 is not None
+    assert path1 is not None
+    assert svg.get_parent_transform(path1) is None
+
+    layer1.set('transform', 'translate(1, 2)')
+    svg.invalidate_transform_cache()
+    expected = ((1.0, 0.0, 1.0), (0.0, 1.0, 2.0))
+    assert svg.get_parent_transform(path1) == expected
+
+    # Stale until invalidated
+    layer1.set('transform', 'scale(2)')
+    assert svg.get_parent_transform(path1) == expected
+    svg.invalidate_transform_cache()
+    expected = ((2.0, 0.0, 0.0), (0.0, 2.0, 0.0))
+    assert svg.get_parent_transform(path1) == expected
+
+    # Moving elements invalidates the cache
+    layer2 = svg.get_node_by_id('layer2')
+    assert layer2 is not None
+    layer2.set('transform', 'translate(5, 5)')
+    svg.create_group(parent=layer2, children=[path1])
+    expected = ((1.0, 0.0, 5.0), (0.0, 1.0, 5.0))
+    assert svg.get_element_transform(path1) == expected
+
+
+def test_get_node_by_id() -> None:
+    """Test id lookups through the lazily built id index."""
+    svg = _parse_test1()
+    rect1 = svg.get_node_by_id('rect1')
+    assert rect1 is not None
+    assert rect1.get('id') == 'rect1'
+    # The root element is not a descendant so it isn't found
+    assert svg.get_node_by_id('svg8') is None
+
+    svg.remove_node(rect1)
+    assert svg.get_node_by_id('rect1') is None
+
+    # Elements detached behind the index's back aren't returned
+    path1 = svg.get_node_by_id('path1')
+    assert path1 is not None
+    path1.getparent().remove(path1)
+    assert svg.get_node_by_id('path1') is None
+
+    # Elements created after the index was built are still found
+    path = svg.create_line((0, 0), (1, 1), attrs={'id': 'newpath'})
+    assert svg.get_node_by_id('newpath') is path
+
+    # Clearing a layer drops its children from the index
+    svg.create_layer('Layer 3', clear=True)
+    assert svg.get_node_by_id('path3') is None
+
+
+def test_generate_id(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test generated ids skip document and previously generated ids."""
+    ctx = _parse_test1()
+    ids = iter(['path1', 'rect1', '_id1', '_id1', '_id2'])
+    monkeypatch.setattr(svg, 'random_id', lambda **_kwargs: next(ids))
+    assert ctx.generate_id() == '_id1'
+    assert ctx.generate_id() == '_id2'
+
+    # Ids set directly aren't reused once the index is invalidated
+    path1 = ctx.get_node_by_id('path1')
+    assert path1 is not None
+    path1.set('id', '_id3')
+    ctx.invalidate_id_index()
+    ids = iter(['_id3', '_id4'])
+    assert ctx.generate_id() == '_id4'
+
+
+def test_create_polygons_nearly_closed() -> None:
+    """Test polygons closed within EPSILON aren't closed again."""
+    ctx = _parse_test1()
+    ctx.set_precision(0)
+    vertices = [(0, 0), (2, 0), (2, 2), (1e-12, 0)]
+    for polygon in (vertices, vertices * 20):
+        for path in (
+            ctx.create_polygons([polygon]),
+            ctx.create_polygon(polygon),
+        ):
+            assert path is not None
+            assert not path.get('d').endswith('0,0 0,0')
+
+
+def test_create_path_batch() -> None:
+    """Test streaming paths matches building them in the tree."""
+    ctx = _parse_test1()
+    vertices = [(0, 0), (1, 0), (1, 1)]
+    curve = [(0, 0), (1, 2), (3, 2), (4, 0)]
+    stream = io.BytesIO()
+    with ctx.create_path_batch(stream, style='fill:none') as writer:
+        writer.line((0, 0), (1, 1), style='stroke:red')
+        writer.curve(curve)
+        writer.polygon(vertices, close_path=True)
+        writer.polygon([])
+
+    group = etree.fromstring(stream.getvalue())
+    assert group.tag == svg.svg_ns('g')
+    assert group.get('style') == 'fill:none'
+    paths = list(group)
+    assert len(paths) == 3
+    expected = [
+        ctx.create_line((0, 0), (1, 1), style='stroke:red'),
+        ctx.create_curve(curve),
+        ctx.create_polygon(vertices, close_path=True),
+    ]
+    for path, elem in zip(paths, expected):
+        assert elem is not None
+        assert path.tag == elem.tag
+        assert path.attrib == elem.attrib
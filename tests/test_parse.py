@@ -4,12 +4,16 @@ from __future__ import annotations
 import itertools
 import math
 import pathlib
+from typing import TYPE_CHECKING
 
 import geom2d
 import geom2d.arc
 from geom2d import const, polyline, transform2d
 from inkext import geomsvg, inksvg, svg
 
+if TYPE_CHECKING:
+    import pytest
+
 # ruff: noqa: T201
 
 TESTDIR = pathlib.Path(__file__).parent
@@ -143,14 +147,31 @@ def test_parse_poly() -> None:
     assert len(paths1[0]) == POLY1_LEN
     assert len(paths1[0]) == len(paths2[0])
 
-    poly1 = list(polyline.polypath_to_polyline(paths1[0]))
-    poly2 = list(polyline.polypath_to_polyline(paths2[0]))
-    poly2.reverse()
+    poly1 = tuple(polyline.polypath_to_polyline(paths1[0]))
+    poly2 = tuple(polyline.polypath_to_polyline(paths2[0]))[::-1]
     # _prcmp(poly1, poly2)
 
     assert poly1 == poly2
 
 
+def test_parse_path_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test memoized path parsing matches uncached parsing."""
+    cached = list(svg.parse_path(POLY1_REVERSED))
+    assert cached == list(svg.parse_path(POLY1_REVERSED))
+    assert all(isinstance(params, tuple) for _, params in cached)
+
+    monkeypatch.setattr(svg, 'PARSE_PATH_CACHE', False)
+    assert list(svg.parse_path(POLY1_REVERSED)) == cached
+
+
+def test_parse_arc_flags() -> None:
+    """Test arc flags that aren't separated from the next parameter."""
+    expected = list(svg.parse_path('M 0,0 A 1,1 0 0 1 2,0 A 1 1 0 1 1 4 0'))
+    assert len(expected) == 3
+    assert list(svg.parse_path('M0,0A1,1 0 012,0A1 1 0 114 0')) == expected
+    assert list(svg.parse_path('M0,0A1,1 0 0,1,2,0a1 1 0 112 0')) == expected
+
+
 def test_parse_arc() -> None:
     """Test paths with ellipses and arcs."""
     print('ARC_1')
@@ -176,8 +197,7 @@ def test_parse_arc() -> None:
     # Test round trip.
     svgpath = svg.geompath_to_svgpath(path)
     path2 = geomsvg.parse_path_geom(svgpath, ellipse_to_bezier=False)[0]
-    for seg1, seg2 in zip(path, path2):
-        assert seg1 == seg2
+    assert list(path) == list(path2)
 
     print('ARC_3')
     path = geomsvg.parse_path_geom(ARC_3_PATH)[0]
@@ -209,8 +229,7 @@ def test_parse_arc() -> None:
     # Test round trip.
     svgpath = svg.geompath_to_svgpath(path)
     path2 = geomsvg.parse_path_geom(svgpath, ellipse_to_bezier=False)[0]
-    for seg1, seg2 in zip(path, path2):
-        assert seg1 == seg2
+    assert list(path) == list(path2)
 
 
 def test_parse_file_arc() -> None: